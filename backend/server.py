@@ -1,53 +1,76 @@
-from fastapi import FastAPI, APIRouter, HTTPException, BackgroundTasks
+from fastapi import FastAPI, APIRouter, HTTPException, BackgroundTasks, Query
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
 from motor.motor_asyncio import AsyncIOMotorClient
 import os
+import re
 import logging
 from pathlib import Path
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, ValidationError
 from typing import List, Optional, Dict, Any
 import uuid
-from datetime import datetime, timedelta
+import hashlib
+import itertools
+import string
+from collections import defaultdict
+from functools import lru_cache
+from datetime import datetime, timedelta, timezone
 import asyncio
 import httpx
+from pymongo import InsertOne, WriteConcern
 import json
-import base64
+import orjson
 from io import BytesIO
-import matplotlib
-matplotlib.use('Agg')  # Use non-interactive backend
-import matplotlib.pyplot as plt
-import seaborn as sns
-import plotly.graph_objects as go
-import plotly.express as px
-from plotly.utils import PlotlyJSONEncoder
-from reportlab.pdfgen import canvas
-from reportlab.lib.pagesizes import letter, A4
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
-from reportlab.lib import colors
-import openpyxl
-from openpyxl.styles import Font, Alignment, PatternFill
+import numpy as np
+
+# plotly, reportlab, and openpyxl are imported lazily inside the chart and
+# export functions so workers that never render them skip the import cost
 
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
 
+# Configure logging before anything that logs
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
 # MongoDB connection
 mongo_url = os.environ['MONGO_URL']
 client = AsyncIOMotorClient(mongo_url)
 db = client[os.environ['DB_NAME']]
 
-# Create the main app without a prefix
-app = FastAPI()
+# Relaxed write concern for derived/regenerable data (charts, funnels):
+# acknowledge on the primary without waiting for the journal
+FAST_WRITE = WriteConcern(w=1, j=False)
+
+# Create the main app without a prefix (orjson handles response encoding at C speed)
+app = FastAPI(default_response_class=ORJSONResponse)
 
 # Create a router with the /api prefix
-api_router = APIRouter(prefix="/api")
+api_router = APIRouter(prefix="/api", default_response_class=ORJSONResponse)
+
+# Shared HTTP client configuration (one pooled client for all outbound calls)
+HTTP_TIMEOUTS = {
+    "default": httpx.Timeout(30.0, connect=10.0, pool=5.0),
+}
+HTTP_LIMITS = httpx.Limits(
+    max_keepalive_connections=20,
+    max_connections=100,
+    keepalive_expiry=30.0
+)
+
+def utcnow() -> datetime:
+    """Timezone-aware replacement for the deprecated datetime.utcnow"""
+    return datetime.now(timezone.utc)
 
 # Define Models
 class StatusCheck(BaseModel):
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
     client_name: str
-    timestamp: datetime = Field(default_factory=datetime.utcnow)
+    timestamp: datetime = Field(default_factory=utcnow)
 
 class StatusCheckCreate(BaseModel):
     client_name: str
@@ -91,8 +114,9 @@ class TherapyAreaAnalysis(BaseModel):
     regulatory_intelligence: Optional[Dict[str, Any]] = None
     clinical_trials_data: Optional[List[Dict[str, Any]]] = None
     risk_assessment: Optional[Dict[str, Any]] = None
-    created_at: datetime = Field(default_factory=datetime.utcnow)
-    updated_at: datetime = Field(default_factory=datetime.utcnow)
+    visualization_data: Optional[Dict[str, Any]] = None
+    created_at: datetime = Field(default_factory=utcnow)
+    updated_at: datetime = Field(default_factory=utcnow)
 
 class PatientFlowFunnel(BaseModel):
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
@@ -103,18 +127,36 @@ class PatientFlowFunnel(BaseModel):
     forecasting_notes: str
     scenario_models: Optional[Dict[str, Any]] = None
     visualization_data: Optional[Dict[str, Any]] = None
-    created_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: datetime = Field(default_factory=utcnow)
+
+class CompetitorProfile(BaseModel):
+    name: str
+    products: str = "Market presence"
+    market_share: int = 15
+    strengths: str = "Established player"
+    weaknesses: str = "See analysis for details"
+
+class CompetitiveAnalysisSchema(BaseModel):
+    """Shape Claude is asked to return for competitive analyses"""
+    competitors: List[CompetitorProfile] = Field(default_factory=list)
+    market_dynamics: str = ""
+    pipeline: str = ""
+    positioning: str = ""
+    catalysts: str = ""
 
 class ResearchResult(BaseModel):
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
     query: str
     source: str
     results: Dict[str, Any]
-    cached_at: datetime = Field(default_factory=datetime.utcnow)
+    cached_at: datetime = Field(default_factory=utcnow)
 
 # Utility functions for data visualization
 def create_funnel_chart(funnel_stages):
     """Create a funnel visualization chart"""
+    import plotly.graph_objects as go
+    from plotly.utils import PlotlyJSONEncoder
+
     stages = [stage['stage'] for stage in funnel_stages]
     percentages = [float(stage['percentage'].replace('%', '')) for stage in funnel_stages]
     
@@ -137,7 +179,10 @@ def create_market_analysis_chart(competitive_data):
     """Create market share visualization"""
     if not competitive_data or 'competitors' not in competitive_data:
         return None
-        
+
+    import plotly.express as px
+    from plotly.utils import PlotlyJSONEncoder
+
     competitors = competitive_data['competitors'][:10]  # Top 10
     names = [comp.get('name', 'Unknown') for comp in competitors]
     market_shares = [comp.get('market_share', 5) for comp in competitors]
@@ -150,27 +195,34 @@ def create_market_analysis_chart(competitive_data):
     
     return json.dumps(fig, cls=PlotlyJSONEncoder)
 
+# Forecast horizon shared by the scenario chart (2024-2029)
+_SCENARIO_YEARS = np.arange(2024, 2030)
+
+# Trace colors per scenario; module-scoped (and named so the local no longer
+# shadows reportlab.lib.colors inside the export path)
+SCENARIO_COLORS = {'optimistic': 'green', 'realistic': 'blue', 'pessimistic': 'red'}
+
 def create_scenario_comparison_chart(scenario_models):
     """Create scenario comparison visualization"""
     if not scenario_models:
         return None
-        
-    scenarios = list(scenario_models.keys())
-    years = list(range(2024, 2030))
-    
+
+    import plotly.graph_objects as go
+    from plotly.utils import PlotlyJSONEncoder
+
     fig = go.Figure()
-    
-    colors = {'optimistic': 'green', 'realistic': 'blue', 'pessimistic': 'red'}
-    
-    for scenario in scenarios:
-        if 'projections' in scenario_models[scenario]:
-            projections = scenario_models[scenario]['projections'][:6]  # 6 years
+
+    for scenario, model in scenario_models.items():
+        if 'projections' in model:
+            # Hand Plotly arrays so PlotlyJSONEncoder serializes one buffer
+            # instead of walking per-element Python lists
+            projections = np.asarray(model['projections'][:6], dtype=np.float32)
             fig.add_trace(go.Scatter(
-                x=years[:len(projections)],
+                x=_SCENARIO_YEARS[:projections.size],
                 y=projections,
                 mode='lines+markers',
                 name=scenario.title(),
-                line=dict(color=colors.get(scenario, 'gray'))
+                line=dict(color=SCENARIO_COLORS.get(scenario, 'gray'))
             ))
     
     fig.update_layout(
@@ -182,9 +234,295 @@ def create_scenario_comparison_chart(scenario_models):
     
     return json.dumps(fig, cls=PlotlyJSONEncoder)
 
+def create_combined_dashboard(funnel_stages, scenario_models, competitive_data):
+    """Fuse the funnel, scenario, and market charts into one subplot figure.
+
+    Building a single figure shares the layout/theme dicts across the three
+    panels and serializes the whole dashboard in one pass instead of three
+    independent json.dumps calls. Not wired into the funnel endpoint yet:
+    the frontend still renders the three per-chart blobs in separate
+    containers, so generating the fused figure there would be pure extra
+    work until the client switches over.
+    """
+    import plotly.graph_objects as go
+    from plotly.subplots import make_subplots
+
+    has_market = bool(competitive_data and 'competitors' in competitive_data)
+    specs = [[{"type": "funnel"}, {"type": "xy"}]]
+    titles = ["Patient Flow Funnel", "Market Forecast Scenarios"]
+    if has_market:
+        specs[0].append({"type": "domain"})
+        titles.append("Competitive Market Landscape")
+
+    fig = make_subplots(rows=1, cols=len(specs[0]), specs=specs, subplot_titles=titles)
+
+    if funnel_stages:
+        stages = [stage['stage'] for stage in funnel_stages]
+        percentages = [float(stage['percentage'].replace('%', '')) for stage in funnel_stages]
+        fig.add_trace(go.Funnel(
+            y=stages,
+            x=percentages,
+            textinfo="value+percent initial",
+            marker_color=["deepskyblue", "lightsalmon", "tan", "teal", "silver", "gold"][:len(stages)],
+            showlegend=False
+        ), row=1, col=1)
+
+    for scenario, model in (scenario_models or {}).items():
+        if 'projections' in model:
+            projections = np.asarray(model['projections'][:6], dtype=np.float32)
+            fig.add_trace(go.Scatter(
+                x=_SCENARIO_YEARS[:projections.size],
+                y=projections,
+                mode='lines+markers',
+                name=scenario.title(),
+                line=dict(color=SCENARIO_COLORS.get(scenario, 'gray'))
+            ), row=1, col=2)
+
+    if has_market:
+        competitors = competitive_data['competitors'][:10]
+        fig.add_trace(go.Pie(
+            labels=[comp.get('name', 'Unknown') for comp in competitors],
+            values=[comp.get('market_share', 5) for comp in competitors],
+            showlegend=False
+        ), row=1, col=3)
+
+    fig.update_layout(font_size=12, hovermode='x unified')
+    return fig.to_json(engine="orjson")
+
+# Batched writes
+class AsyncBatcher:
+    """Coalesce single-document inserts into unordered bulk writes.
+
+    Documents submitted within the flush window (or up to max_batch_size)
+    are written with one bulk_write round-trip; submit() resolves once the
+    batch containing the document has flushed.
+    """
+
+    def __init__(self, collection, max_batch_size: int = 100, flush_interval: float = 0.02):
+        self.collection = collection
+        self.max_batch_size = max_batch_size
+        self.flush_interval = flush_interval
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._drain())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def submit(self, doc: dict):
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((doc, future))
+        await future
+
+    async def _drain(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.flush_interval
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout=remaining))
+                except asyncio.TimeoutError:
+                    break
+            await self._flush(batch)
+
+    async def _flush(self, batch):
+        try:
+            await self.collection.bulk_write(
+                [InsertOne(doc) for doc, _ in batch], ordered=False
+            )
+        except Exception as e:
+            logger.exception("Batched write error")
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+        else:
+            for _, future in batch:
+                if not future.done():
+                    future.set_result(None)
+
+status_check_batcher = AsyncBatcher(db.status_checks)
+
+# Research cache (Mongo-backed, TTL index created at startup)
+RESEARCH_CACHE_TTL = timedelta(hours=24)
+
+def research_cache_key(therapy_area: str) -> str:
+    """Normalize a therapy area into a cache key"""
+    return therapy_area.strip().lower()
+
+async def cached_call(source: str, key: str, coro_factory, ttl: timedelta = RESEARCH_CACHE_TTL):
+    """Return a fresh cached result for (source, key), or invoke and cache it.
+
+    Skips caching empty results so transient failures don't get pinned
+    for the full TTL.
+    """
+    cached = await db.research_cache.find_one({
+        "source": source,
+        "key": key,
+        "cached_at": {"$gte": utcnow() - ttl}
+    })
+    if cached:
+        return cached["results"]
+
+    results = await coro_factory()
+    if results:
+        await db.research_cache.update_one(
+            {"source": source, "key": key},
+            {"$set": {"results": results, "cached_at": utcnow()}},
+            upsert=True
+        )
+    return results
+
+async def invalidate_research_cache(source: str, key: str):
+    """Drop a cached research result so the next call fetches fresh data"""
+    await db.research_cache.delete_one({"source": source, "key": key})
+
+# Model used for every LLM chat in the app; hoisted so a model bump is a
+# one-line change
+LLM_MODEL = "claude-sonnet-4-20250514"
+
+# Global cap on concurrent LLM calls so load spikes don't trip provider
+# rate limits and retry storms
+LLM_SEM = asyncio.Semaphore(int(os.getenv("LLM_MAX_CONCURRENCY", "8")))
+
+# Chat session IDs only need to be unique, not unguessable: a random
+# per-process prefix plus a monotonic counter keeps them distinct across
+# workers without an OS RNG call per request
+_PROC = uuid.uuid4().hex[:8]
+_session_counter = itertools.count()
+
+def _session_id(prefix: str) -> str:
+    return f"{prefix}_{_PROC}_{next(_session_counter)}"
+
+# Prompt templates for the hot LLM endpoints, compiled once at import so
+# per-request work is a substitute() call instead of rebuilding the large
+# literals (the funnel skeleton alone is ~2KB)
+RISK_PROMPT_TMPL = string.Template("""
+        Based on the therapy area analysis for $therapy_area, assess key risks across:
+
+        1. Clinical Risks (efficacy, safety, trial design, endpoints)
+        2. Regulatory Risks (approval pathways, requirements, precedents)
+        3. Commercial Risks (competition, market access, pricing pressure)
+        4. Operational Risks (manufacturing, supply chain, partnerships)
+        5. Market Risks (market size, adoption, reimbursement)
+
+        For each category, provide: high/medium/low risk level, key factors, mitigation strategies
+        Structure as JSON with risk categories and overall risk score (1-10)
+        """)
+
+SCENARIO_PROMPT_TMPL = string.Template("""
+        Create a detailed forecasting model for $therapy_area.
+
+        Provide:
+        1. Key assumptions (market penetration, pricing, competition)
+        2. 6-year revenue projections (2024-2029) in millions USD
+        3. Peak sales estimates and timing
+        4. Market share trajectory
+        5. Key success/failure factors
+
+        Structure as a single JSON object containing:
+        - assumptions: list of key assumptions
+        - projections: array of 6 annual revenue numbers
+        - peak_sales: number and year
+        - market_share_trajectory: array of 6 percentages
+        - key_factors: list of critical success factors
+
+        Model the $scenario scenario only.""")
+
+FUNNEL_PROMPT_TMPL = string.Template("""
+        Based on the following therapy area analysis for $therapy_area, create a comprehensive patient flow funnel suitable for pharmaceutical forecasting:
+
+        THERAPY AREA: $therapy_area
+        DISEASE SUMMARY: $disease_summary...
+        TREATMENT ALGORITHM: $treatment_algorithm...
+        PATIENT JOURNEY: $patient_journey...
+
+        Please provide your response in exactly this JSON structure:
+
+        {
+            "funnel_stages": [
+                {
+                    "stage": "Total Population at Risk",
+                    "description": "Overall population that could develop this condition",
+                    "percentage": "100%",
+                    "notes": "Base population estimates"
+                },
+                {
+                    "stage": "Disease Incidence/Prevalence",
+                    "description": "Population that develops or has the condition",
+                    "percentage": "X%",
+                    "notes": "Epidemiological data"
+                },
+                {
+                    "stage": "Diagnosis Rate",
+                    "description": "Patients who get properly diagnosed",
+                    "percentage": "X%",
+                    "notes": "Diagnosis challenges and rates"
+                },
+                {
+                    "stage": "Treatment Eligible",
+                    "description": "Diagnosed patients eligible for treatment",
+                    "percentage": "X%",
+                    "notes": "Contraindications and eligibility criteria"
+                },
+                {
+                    "stage": "Treated Patients",
+                    "description": "Patients actually receiving treatment",
+                    "percentage": "X%",
+                    "notes": "Treatment uptake and access"
+                },
+                {
+                    "stage": "Target Patient Population",
+                    "description": "Specific target for your therapy/product",
+                    "percentage": "X%",
+                    "notes": "Specific targeting criteria"
+                }
+            ],
+            "total_addressable_population": "Detailed TAM analysis with numbers and rationale",
+            "forecasting_notes": "Key assumptions, market dynamics, competitive landscape considerations, and forecasting methodology recommendations"
+        }
+
+        Fill in realistic percentages and detailed descriptions based on current medical literature and market data for $therapy_area.
+        """)
+
+async def _send_llm_message(chat, message):
+    """Send one chat message under the global LLM concurrency cap"""
+    async with LLM_SEM:
+        return await chat.send_message(message)
+
+@lru_cache(maxsize=32)
+def _get_chat_factory(api_key: str):
+    """Cache the emergentintegrations import and per-key chat factory.
+
+    The SDK import only happens once per process and repeat callers with
+    the same api_key skip the import machinery entirely.
+    """
+    from emergentintegrations.llm.chat import LlmChat, UserMessage
+    return LlmChat, UserMessage, api_key
+
 # Web Research Functions
 async def search_clinical_trials(therapy_area: str):
-    """Search ClinicalTrials.gov for relevant trials"""
+    """Search ClinicalTrials.gov for relevant trials (cached per therapy area)"""
+    return await cached_call(
+        "clinical_trials",
+        research_cache_key(therapy_area),
+        lambda: _fetch_clinical_trials(therapy_area)
+    )
+
+async def _fetch_clinical_trials(therapy_area: str):
+    """Query ClinicalTrials.gov directly"""
     try:
         url = "https://clinicaltrials.gov/api/v2/studies"
         params = {
@@ -194,26 +532,32 @@ async def search_clinical_trials(therapy_area: str):
             "fields": "NCTId,BriefTitle,OverallStatus,Phase,Condition"
         }
         
-        timeout = httpx.Timeout(30.0)
-        async with httpx.AsyncClient(timeout=timeout) as client:
-            response = await client.get(url, params=params)
-            if response.status_code == 200:
-                data = response.json()
-                return data.get('studies', [])
+        response = await app.state.http_client.get(url, params=params)
+        if response.status_code == 200:
+            data = response.json()
+            return data.get('studies', [])
     except Exception as e:
-        logging.error(f"Clinical trials search error: {str(e)}")
+        logger.exception("Clinical trials search error")
     return []
 
 async def search_regulatory_intelligence(therapy_area: str, api_key: str):
+    """Generate regulatory intelligence using Claude (cached per therapy area)"""
+    return await cached_call(
+        "regulatory_intelligence",
+        research_cache_key(therapy_area),
+        lambda: _generate_regulatory_intelligence(therapy_area, api_key)
+    )
+
+async def _generate_regulatory_intelligence(therapy_area: str, api_key: str):
     """Generate regulatory intelligence using Claude"""
     try:
-        from emergentintegrations.llm.chat import LlmChat, UserMessage
-        
+        LlmChat, UserMessage, _ = _get_chat_factory(api_key)
+
         chat = LlmChat(
             api_key=api_key,
-            session_id=f"regulatory_{uuid.uuid4()}",
+            session_id=_session_id("regulatory"),
             system_message="You are a regulatory affairs expert specializing in pharmaceutical approvals and market access."
-        ).with_model("anthropic", "claude-sonnet-4-20250514").with_max_tokens(2048)
+        ).with_model("anthropic", LLM_MODEL).with_max_tokens(2048)
         
         prompt = f"""
         Provide comprehensive regulatory intelligence for {therapy_area} including:
@@ -227,11 +571,11 @@ async def search_regulatory_intelligence(therapy_area: str, api_key: str):
         Structure as JSON with these sections: pathways, recent_activity, trends, timelines, market_access
         """
         
-        response = await chat.send_message(UserMessage(text=prompt))
+        response = await _send_llm_message(chat, UserMessage(text=prompt))
         
         # Try to parse as JSON, fallback to structured text
         try:
-            return json.loads(response)
+            return orjson.loads(response)
         except:
             return {
                 "pathways": "See full analysis",
@@ -241,193 +585,242 @@ async def search_regulatory_intelligence(therapy_area: str, api_key: str):
                 "market_access": response
             }
     except Exception as e:
-        logging.error(f"Regulatory intelligence error: {str(e)}")
+        logger.exception("Regulatory intelligence error")
         return {}
 
+# Parsing constants for the competitive-analysis response (hoisted so the
+# per-line loop doesn't rebuild them or recompile the regex on every call)
+_SECTION_KEYWORDS = {
+    "competitors": ("COMPETITOR", "MAJOR", "KEY PLAYER"),
+    "market_dynamics": ("MARKET DYNAMIC", "MARKET TREND"),
+    "pipeline": ("PIPELINE", "DEVELOPMENT"),
+    "positioning": ("POSITIONING", "DIFFERENTIAT"),
+    "catalysts": ("CATALYST", "UPCOMING", "EVENTS"),
+}
+_PCT_RE = re.compile(r'(\d+)%')
+_JSON_DECODER = json.JSONDecoder()
+
+def extract_first_json_object(text: str):
+    """Return the first complete JSON object embedded in text, or None.
+
+    raw_decode stops at the end of the first balanced object, so prose or
+    markdown fences around the JSON and truncated trailing output don't
+    break parsing the way a find('{')/rfind('}') slice does.
+
+    The common case — the model returned nothing but the JSON object — is
+    handled first by orjson, which parses multi-KB payloads several times
+    faster than the stdlib decoder.
+    """
+    stripped = text.strip()
+    if stripped.startswith('{') and stripped.endswith('}'):
+        try:
+            return orjson.loads(stripped)
+        except orjson.JSONDecodeError:
+            pass
+    start = text.find('{')
+    while start != -1:
+        try:
+            obj, _ = _JSON_DECODER.raw_decode(text, start)
+            return obj
+        except json.JSONDecodeError:
+            start = text.find('{', start + 1)
+    return None
+
+# One-pass extractor for the five fixed headers in the therapy-analysis response
+_SECTION_RE = re.compile(
+    r'##\s*(?P<name>DISEASE SUMMARY|STAGING|BIOMARKERS|TREATMENT ALGORITHM|PATIENT JOURNEY)'
+    r'\s*\n(?P<body>.*?)(?=\n##\s|\Z)',
+    re.DOTALL
+)
+_BIG_PHARMA = frozenset({
+    'NOVARTIS', 'PFIZER', 'ROCHE', 'BRISTOL', 'MERCK',
+    'JOHNSON', 'ABBVIE', 'GILEAD', 'BIOGEN', 'AMGEN'
+})
+
 async def generate_competitive_analysis(therapy_area: str, api_key: str):
+    """Generate competitive landscape analysis using Claude (cached per therapy area)"""
+    return await cached_call(
+        "competitive_analysis",
+        research_cache_key(therapy_area),
+        lambda: _generate_competitive_analysis(therapy_area, api_key)
+    )
+
+async def _generate_competitive_analysis(therapy_area: str, api_key: str):
     """Generate competitive landscape analysis using Claude"""
     try:
-        from emergentintegrations.llm.chat import LlmChat, UserMessage
-        
+        LlmChat, UserMessage, _ = _get_chat_factory(api_key)
+
         chat = LlmChat(
             api_key=api_key,
-            session_id=f"competitive_{uuid.uuid4()}",
+            session_id=_session_id("competitive"),
             system_message="You are a pharmaceutical competitive intelligence analyst with expertise in market dynamics and competitive positioning."
-        ).with_model("anthropic", "claude-sonnet-4-20250514").with_max_tokens(3072)
+        ).with_model("anthropic", LLM_MODEL).with_max_tokens(3072)
         
         prompt = f"""
-        Conduct a comprehensive competitive analysis for {therapy_area} therapy area. 
-        
-        Please provide a structured analysis covering:
-        
-        1. MAJOR COMPETITORS: List the top 5-7 companies/products in this space with:
-           - Company name
-           - Key products/drugs 
-           - Estimated market share
-           - Main strengths
-           - Key weaknesses
-        
-        2. MARKET DYNAMICS: Current market trends, growth drivers, challenges
-        
-        3. PIPELINE ANALYSIS: Key drugs in development (Phase II/III)
-        
-        4. COMPETITIVE POSITIONING: How different players differentiate
-        
-        5. UPCOMING CATALYSTS: Key events, approvals, patent expiries in next 2 years
-        
-        Be specific with actual company names, drug names, and real market data where possible.
-        Focus on providing actionable competitive intelligence.
-        """
-        
-        response = await chat.send_message(UserMessage(text=prompt))
-        
-        # Try to extract structured information from the response
-        lines = response.split('\n')
-        competitors = []
-        market_dynamics = ""
-        pipeline = ""
-        positioning = ""
-        catalysts = ""
-        
-        current_section = ""
-        current_content = []
-        
-        for line in lines:
-            line = line.strip()
-            if not line:
-                continue
-                
-            if any(keyword in line.upper() for keyword in ["COMPETITOR", "MAJOR", "KEY PLAYER"]):
-                current_section = "competitors"
-                current_content = []
-            elif any(keyword in line.upper() for keyword in ["MARKET DYNAMIC", "MARKET TREND"]):
-                current_section = "market_dynamics" 
-                current_content = []
-            elif any(keyword in line.upper() for keyword in ["PIPELINE", "DEVELOPMENT"]):
-                current_section = "pipeline"
-                current_content = []
-            elif any(keyword in line.upper() for keyword in ["POSITIONING", "DIFFERENTIAT"]):
-                current_section = "positioning"
-                current_content = []
-            elif any(keyword in line.upper() for keyword in ["CATALYST", "UPCOMING", "EVENTS"]):
-                current_section = "catalysts"
-                current_content = []
-            else:
-                current_content.append(line)
-                
-                # Process competitor lines
-                if current_section == "competitors" and line:
-                    # Try to extract company info from various formats
-                    if any(char in line for char in ['-', '•', '1.', '2.', '3.']):
-                        parts = line.split(':', 1) if ':' in line else [line, ""]
-                        company_part = parts[0].strip()
-                        details_part = parts[1].strip() if len(parts) > 1 else ""
-                        
-                        # Clean company name
-                        for prefix in ['1.', '2.', '3.', '4.', '5.', '6.', '7.', '-', '•']:
-                            company_part = company_part.replace(prefix, '').strip()
-                        
-                        if company_part and len(company_part) > 2:
-                            # Extract market share if present
-                            market_share = 25  # Default
-                            if '%' in details_part:
-                                import re
-                                share_match = re.search(r'(\d+)%', details_part)
-                                if share_match:
-                                    market_share = int(share_match.group(1))
-                            
-                            competitors.append({
-                                "name": company_part[:50],  # Limit length
-                                "products": details_part[:100] if details_part else "Market presence",
-                                "market_share": market_share,
-                                "strengths": details_part[:100] if details_part else "Established player",
-                                "weaknesses": "See analysis for details"
-                            })
-            
-            # Collect content for other sections
-            if current_section == "market_dynamics" and current_content:
-                market_dynamics = '\n'.join(current_content[-10:])  # Last 10 lines
-            elif current_section == "pipeline" and current_content:
-                pipeline = '\n'.join(current_content[-10:])
-            elif current_section == "positioning" and current_content:
-                positioning = '\n'.join(current_content[-10:])
-            elif current_section == "catalysts" and current_content:
-                catalysts = '\n'.join(current_content[-10:])
-        
-        # Ensure we have some competitors
-        if not competitors:
-            # Extract from full response using basic parsing
-            response_lines = response.split('\n')
-            for line in response_lines:
-                if any(company in line.upper() for company in ['NOVARTIS', 'PFIZER', 'ROCHE', 'BRISTOL', 'MERCK', 'JOHNSON', 'ABBVIE', 'GILEAD', 'BIOGEN', 'AMGEN']):
-                    competitors.append({
-                        "name": line.strip()[:30],
-                        "products": "Multiple products in portfolio",
-                        "market_share": 15,
-                        "strengths": "Established pharmaceutical company",
-                        "weaknesses": "High competition"
-                    })
-                if len(competitors) >= 5:
-                    break
-        
-        # Ensure we have content for other sections
-        if not market_dynamics:
-            market_dynamics = response[:500] + "..."
-        if not pipeline:
-            pipeline = "Pipeline analysis included in full competitive analysis"
-        if not catalysts:
-            catalysts = "Key market catalysts and events detailed in comprehensive analysis"
-        
-        return {
-            "competitors": competitors[:7],  # Top 7
-            "market_dynamics": market_dynamics,
-            "pipeline": pipeline,
-            "positioning": positioning or "Competitive positioning varies by therapeutic focus and market presence",
-            "catalysts": catalysts,
-            "full_analysis": response
-        }
-        
-    except Exception as e:
-        logging.error(f"Competitive analysis error: {str(e)}")
-        return {
+        Conduct a comprehensive competitive analysis for {therapy_area} therapy area.
+
+        Respond with a single JSON object matching this schema (no prose outside the JSON):
+
+        {{
             "competitors": [
-                {"name": "Analysis Error", "market_share": 0, "strengths": "Please try again", "products": str(e)[:100]}
+                {{
+                    "name": "Company name",
+                    "products": "Key products/drugs",
+                    "market_share": 25,
+                    "strengths": "Main strengths",
+                    "weaknesses": "Key weaknesses"
+                }}
             ],
-            "market_dynamics": f"Error generating analysis: {str(e)}",
-            "pipeline": "Please regenerate analysis",
-            "positioning": "Error in analysis generation",
-            "catalysts": "Please try again with valid API key",
-            "full_analysis": f"Error: {str(e)}"
-        }
+            "market_dynamics": "Current market trends, growth drivers, challenges",
+            "pipeline": "Key drugs in development (Phase II/III)",
+            "positioning": "How different players differentiate",
+            "catalysts": "Key events, approvals, patent expiries in next 2 years"
+        }}
+
+        Include the top 5-7 companies/products. Be specific with actual company names,
+        drug names, and real market data where possible.
+        """
+
+        response = await _send_llm_message(chat, UserMessage(text=prompt))
+
+        # Prefer the structured JSON response; fall back to the legacy
+        # free-text parser only if the model ignored the schema
+        try:
+            parsed = extract_first_json_object(response)
+            if parsed is None:
+                raise ValueError("no JSON object in response")
+            schema = CompetitiveAnalysisSchema(**parsed)
+            data = schema.model_dump()
+            data["competitors"] = data["competitors"][:7]  # Top 7
+            data["full_analysis"] = response
+            return data
+        except (ValidationError, ValueError, TypeError):
+            return _parse_competitive_text(response)
+
+    except Exception:
+        # Return empty like the other research helpers so cached_call skips
+        # the result and a retry gets a fresh LLM call, instead of pinning an
+        # error payload in research_cache for the full TTL
+        logger.exception("Competitive analysis error")
+        return {}
+
+def _parse_competitive_text(response: str) -> dict:
+    """Legacy parser for free-form competitive analysis text"""
+    lines = response.split('\n')
+    competitors = []
+    section_buffers = defaultdict(list)
+    current_section = ""
+
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+
+        upper = line.upper()
+        matched_section = next(
+            (name for name, keywords in _SECTION_KEYWORDS.items()
+             if any(keyword in upper for keyword in keywords)),
+            None
+        )
+        if matched_section:
+            current_section = matched_section
+        else:
+            section_buffers[current_section].append(line)
+
+            # Process competitor lines
+            if current_section == "competitors" and line:
+                # Try to extract company info from various formats
+                if any(char in line for char in ['-', '•', '1.', '2.', '3.']):
+                    parts = line.split(':', 1) if ':' in line else [line, ""]
+                    company_part = parts[0].strip()
+                    details_part = parts[1].strip() if len(parts) > 1 else ""
+                    
+                    # Clean company name
+                    for prefix in ['1.', '2.', '3.', '4.', '5.', '6.', '7.', '-', '•']:
+                        company_part = company_part.replace(prefix, '').strip()
+                    
+                    if company_part and len(company_part) > 2:
+                        # Extract market share if present
+                        market_share = 25  # Default
+                        if '%' in details_part:
+                            share_match = _PCT_RE.search(details_part)
+                            if share_match:
+                                market_share = int(share_match.group(1))
+                        
+                        competitors.append({
+                            "name": company_part[:50],  # Limit length
+                            "products": details_part[:100] if details_part else "Market presence",
+                            "market_share": market_share,
+                            "strengths": details_part[:100] if details_part else "Established player",
+                            "weaknesses": "See analysis for details"
+                        })
+
+    # Join each section exactly once after the loop (last 10 lines apiece)
+    # instead of rebuilding the joined string on every iteration
+    market_dynamics = '\n'.join(section_buffers["market_dynamics"][-10:])
+    pipeline = '\n'.join(section_buffers["pipeline"][-10:])
+    positioning = '\n'.join(section_buffers["positioning"][-10:])
+    catalysts = '\n'.join(section_buffers["catalysts"][-10:])
+
+    # Ensure we have some competitors
+    if not competitors:
+        # Extract from full response using basic parsing
+        response_lines = response.split('\n')
+        for line in response_lines:
+            upper = line.upper()
+            if any(company in upper for company in _BIG_PHARMA):
+                competitors.append({
+                    "name": line.strip()[:30],
+                    "products": "Multiple products in portfolio",
+                    "market_share": 15,
+                    "strengths": "Established pharmaceutical company",
+                    "weaknesses": "High competition"
+                })
+            if len(competitors) >= 5:
+                break
+    
+    # Ensure we have content for other sections
+    if not market_dynamics:
+        market_dynamics = response[:500] + "..."
+    if not pipeline:
+        pipeline = "Pipeline analysis included in full competitive analysis"
+    if not catalysts:
+        catalysts = "Key market catalysts and events detailed in comprehensive analysis"
+    
+    return {
+        "competitors": competitors[:7],  # Top 7
+        "market_dynamics": market_dynamics,
+        "pipeline": pipeline,
+        "positioning": positioning or "Competitive positioning varies by therapeutic focus and market presence",
+        "catalysts": catalysts,
+        "full_analysis": response
+    }
 
 async def generate_risk_assessment(therapy_area: str, analysis_data: dict, api_key: str):
+    """Generate comprehensive risk assessment (cached per therapy area)"""
+    return await cached_call(
+        "risk_assessment",
+        research_cache_key(therapy_area),
+        lambda: _generate_risk_assessment(therapy_area, analysis_data, api_key)
+    )
+
+async def _generate_risk_assessment(therapy_area: str, analysis_data: dict, api_key: str):
     """Generate comprehensive risk assessment"""
     try:
-        from emergentintegrations.llm.chat import LlmChat, UserMessage
-        
+        LlmChat, UserMessage, _ = _get_chat_factory(api_key)
+
         chat = LlmChat(
             api_key=api_key,
-            session_id=f"risk_{uuid.uuid4()}",
+            session_id=_session_id("risk"),
             system_message="You are a pharmaceutical risk assessment expert specializing in clinical, regulatory, and commercial risk analysis."
-        ).with_model("anthropic", "claude-sonnet-4-20250514").with_max_tokens(2048)
-        
-        prompt = f"""
-        Based on the therapy area analysis for {therapy_area}, assess key risks across:
-        
-        1. Clinical Risks (efficacy, safety, trial design, endpoints)
-        2. Regulatory Risks (approval pathways, requirements, precedents)  
-        3. Commercial Risks (competition, market access, pricing pressure)
-        4. Operational Risks (manufacturing, supply chain, partnerships)
-        5. Market Risks (market size, adoption, reimbursement)
-        
-        For each category, provide: high/medium/low risk level, key factors, mitigation strategies
-        Structure as JSON with risk categories and overall risk score (1-10)
-        """
+        ).with_model("anthropic", LLM_MODEL).with_max_tokens(2048)
         
-        response = await chat.send_message(UserMessage(text=prompt))
+        prompt = RISK_PROMPT_TMPL.substitute(therapy_area=therapy_area)
+
+        response = await _send_llm_message(chat, UserMessage(text=prompt))
         
         try:
-            return json.loads(response)
+            return orjson.loads(response)
         except:
             return {
                 "clinical_risk": {"level": "Medium", "factors": ["See analysis"]},
@@ -439,67 +832,67 @@ async def generate_risk_assessment(therapy_area: str, analysis_data: dict, api_k
                 "full_assessment": response
             }
     except Exception as e:
-        logging.error(f"Risk assessment error: {str(e)}")
+        logger.exception("Risk assessment error")
         return {}
 
 async def generate_scenario_models(therapy_area: str, analysis_data: dict, scenarios: List[str], api_key: str):
+    """Generate multi-scenario forecasting models (cached per therapy area + scenario set)"""
+    return await cached_call(
+        "scenario_models",
+        f"{research_cache_key(therapy_area)}:{','.join(sorted(scenarios))}",
+        lambda: _generate_scenario_models(therapy_area, analysis_data, scenarios, api_key)
+    )
+
+async def _generate_scenario_models(therapy_area: str, analysis_data: dict, scenarios: List[str], api_key: str):
     """Generate multi-scenario forecasting models"""
     try:
-        from emergentintegrations.llm.chat import LlmChat, UserMessage
-        
-        chat = LlmChat(
-            api_key=api_key,
-            session_id=f"scenarios_{uuid.uuid4()}",
-            system_message="You are a pharmaceutical forecasting expert specializing in scenario modeling and market projections."
-        ).with_model("anthropic", "claude-sonnet-4-20250514").with_max_tokens(3072)
-        
-        prompt = f"""
-        Create detailed forecasting scenarios for {therapy_area} across {scenarios}.
-        
-        For each scenario ({', '.join(scenarios)}), provide:
-        1. Key assumptions (market penetration, pricing, competition)
-        2. 6-year revenue projections (2024-2029) in millions USD
-        3. Peak sales estimates and timing
-        4. Market share trajectory
-        5. Key success/failure factors
-        
-        Structure as JSON with scenario names as keys, each containing:
-        - assumptions: list of key assumptions
-        - projections: array of 6 annual revenue numbers
-        - peak_sales: number and year
-        - market_share_trajectory: array of 6 percentages
-        - key_factors: list of critical success factors
-        """
-        
-        response = await chat.send_message(UserMessage(text=prompt))
-        
-        try:
-            parsed = json.loads(response)
-            return parsed
-        except:
-            # Create structured fallback with dummy data
-            fallback = {}
+        LlmChat, UserMessage, _ = _get_chat_factory(api_key)
+
+        async def generate_one_scenario(index: int, scenario: str):
+            chat = LlmChat(
+                api_key=api_key,
+                session_id=_session_id("scenarios"),
+                system_message="You are a pharmaceutical forecasting expert specializing in scenario modeling and market projections."
+            ).with_model("anthropic", LLM_MODEL).with_max_tokens(3072)
+
+            prompt = SCENARIO_PROMPT_TMPL.substitute(therapy_area=therapy_area, scenario=scenario)
+            response = await _send_llm_message(chat, UserMessage(text=prompt))
+
+            parsed = extract_first_json_object(response)
+            if isinstance(parsed, dict) and 'projections' in parsed:
+                return parsed
+
+            # Structured fallback with dummy data for this scenario
             base_projections = [100, 250, 500, 750, 900, 800]  # Example progression
-            
-            for i, scenario in enumerate(scenarios):
-                multiplier = [0.6, 1.0, 1.8][min(i, 2)]  # pessimistic, realistic, optimistic
-                fallback[scenario] = {
-                    "assumptions": [f"{scenario.title()} market conditions"],
-                    "projections": [int(p * multiplier) for p in base_projections],
-                    "peak_sales": int(900 * multiplier),
-                    "market_share_trajectory": [2, 5, 8, 12, 15, 13],
-                    "key_factors": [f"{scenario.title()} execution"],
-                    "full_analysis": response
-                }
-            return fallback
+            multiplier = [0.6, 1.0, 1.8][min(index, 2)]  # pessimistic, realistic, optimistic
+            return {
+                "assumptions": [f"{scenario.title()} market conditions"],
+                "projections": [int(p * multiplier) for p in base_projections],
+                "peak_sales": int(900 * multiplier),
+                "market_share_trajectory": [2, 5, 8, 12, 15, 13],
+                "key_factors": [f"{scenario.title()} execution"],
+                "full_analysis": response
+            }
+
+        # Fan the scenarios out concurrently; LLM_SEM (inside
+        # _send_llm_message) keeps overall provider concurrency capped
+        models = await asyncio.gather(
+            *(generate_one_scenario(i, s) for i, s in enumerate(scenarios))
+        )
+        return dict(zip(scenarios, models))
     except Exception as e:
-        logging.error(f"Scenario modeling error: {str(e)}")
+        logger.exception("Scenario modeling error")
         return {}
 
 # Export Functions
 def generate_pdf_report(analysis: dict, funnel: dict = None):
     """Generate comprehensive PDF report"""
     try:
+        from reportlab.lib.pagesizes import A4
+        from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+        from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
+        from reportlab.lib import colors
+
         buffer = BytesIO()
         doc = SimpleDocTemplate(buffer, pagesize=A4)
         styles = getSampleStyleSheet()
@@ -560,16 +953,18 @@ def generate_pdf_report(analysis: dict, funnel: dict = None):
             story.append(Spacer(1, 20))
         
         doc.build(story)
-        buffer.seek(0)
-        return base64.b64encode(buffer.getvalue()).decode()
-        
+        return buffer.getvalue()
+
     except Exception as e:
-        logging.error(f"PDF generation error: {str(e)}")
+        logger.exception("PDF generation error")
         return None
 
 def generate_excel_export(analysis: dict, funnel: dict = None):
     """Generate Excel forecasting model"""
     try:
+        import openpyxl
+        from openpyxl.styles import Font
+
         buffer = BytesIO()
         wb = openpyxl.Workbook()
         
@@ -623,13 +1018,55 @@ def generate_excel_export(analysis: dict, funnel: dict = None):
                 row += 1
         
         wb.save(buffer)
-        buffer.seek(0)
-        return base64.b64encode(buffer.getvalue()).decode()
-        
+        return buffer.getvalue()
+
     except Exception as e:
-        logging.error(f"Excel generation error: {str(e)}")
+        logger.exception("Excel generation error")
         return None
 
+# Export job runner (keeps reportlab/openpyxl work off the event loop)
+async def run_export(job_id: str, request: ExportRequest):
+    """Execute an export job in the background and persist the result"""
+    try:
+        # The two lookups are independent; overlap the Mongo round-trips
+        analysis, funnel = await asyncio.gather(
+            db.therapy_analyses.find_one({"id": request.analysis_id}, {"_id": 0}),
+            db.patient_flow_funnels.find_one({"analysis_id": request.analysis_id}, {"_id": 0}),
+        )
+
+        if request.export_type == "pdf":
+            export_data = await asyncio.to_thread(generate_pdf_report, analysis, funnel)
+            filename = f"{analysis['therapy_area'].replace(' ', '_')}_analysis.pdf"
+        elif request.export_type == "excel":
+            export_data = await asyncio.to_thread(generate_excel_export, analysis, funnel)
+            filename = f"{analysis['therapy_area'].replace(' ', '_')}_model.xlsx"
+        else:
+            export_data = None
+            filename = None
+
+        if export_data:
+            await db.export_jobs.update_one(
+                {"id": job_id},
+                {"$set": {
+                    "status": "done",
+                    "export_type": request.export_type,
+                    "data": export_data,
+                    "filename": filename,
+                    "completed_at": utcnow()
+                }}
+            )
+        else:
+            await db.export_jobs.update_one(
+                {"id": job_id},
+                {"$set": {"status": "failed", "error": "Export generation failed"}}
+            )
+    except Exception as e:
+        logger.exception("Export job %s error", job_id)
+        await db.export_jobs.update_one(
+            {"id": job_id},
+            {"$set": {"status": "failed", "error": str(e)}}
+        )
+
 # API Routes
 @api_router.get("/")
 async def root():
@@ -637,29 +1074,38 @@ async def root():
 
 @api_router.post("/status", response_model=StatusCheck)
 async def create_status_check(input: StatusCheckCreate):
-    status_dict = input.dict()
+    status_dict = input.model_dump()
     status_obj = StatusCheck(**status_dict)
-    _ = await db.status_checks.insert_one(status_obj.dict())
+    await status_check_batcher.submit(status_obj.model_dump())
     return status_obj
 
-@api_router.get("/status", response_model=List[StatusCheck])
+@api_router.get("/status")
 async def get_status_checks():
-    status_checks = await db.status_checks.find().to_list(1000)
-    return [StatusCheck(**status_check) for status_check in status_checks]
+    # Stream newline-delimited JSON straight off the cursor: memory stays
+    # constant regardless of collection size and the first batch is sent as
+    # soon as Mongo returns it
+    async def stream():
+        cursor = db.status_checks.find(
+            {}, projection={"_id": 0, "id": 1, "client_name": 1, "timestamp": 1}
+        ).batch_size(200)
+        async for status_check in cursor:
+            yield orjson.dumps(status_check) + b"\n"
+
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
 
 @api_router.post("/analyze-therapy", response_model=TherapyAreaAnalysis)
 async def analyze_therapy_area(request: TherapyAreaRequest):
     try:
-        from emergentintegrations.llm.chat import LlmChat, UserMessage
-        
+        LlmChat, UserMessage, _ = _get_chat_factory(request.api_key)
+
         # Basic analysis using Claude
         chat = LlmChat(
             api_key=request.api_key,
-            session_id=f"therapy_analysis_{uuid.uuid4()}",
+            session_id=_session_id("therapy_analysis"),
             system_message="""You are a world-class pharmaceutical consultant specializing in therapy area analysis and forecasting. 
             You have deep expertise in disease pathology, treatment algorithms, biomarkers, and patient journey mapping.
             Provide comprehensive, accurate, and structured analysis suitable for pharmaceutical forecasting models."""
-        ).with_model("anthropic", "claude-sonnet-4-20250514").with_max_tokens(4096)
+        ).with_model("anthropic", LLM_MODEL).with_max_tokens(4096)
         
         product_info = f" for the product '{request.product_name}'" if request.product_name else ""
         prompt = f"""
@@ -686,32 +1132,37 @@ async def analyze_therapy_area(request: TherapyAreaRequest):
         """
         
         user_message = UserMessage(text=prompt)
-        response = await chat.send_message(user_message)
-        
-        # Parse the response into structured sections
-        sections = response.split("## ")
-        disease_summary = ""
-        staging = ""
-        biomarkers = ""
-        treatment_algorithm = ""
-        patient_journey = ""
-        
-        for section in sections[1:]:
-            if section.startswith("DISEASE SUMMARY"):
-                disease_summary = section.replace("DISEASE SUMMARY\n", "").strip()
-            elif section.startswith("STAGING"):
-                staging = section.replace("STAGING\n", "").strip()
-            elif section.startswith("BIOMARKERS"):
-                biomarkers = section.replace("BIOMARKERS\n", "").strip()
-            elif section.startswith("TREATMENT ALGORITHM"):
-                treatment_algorithm = section.replace("TREATMENT ALGORITHM\n", "").strip()
-            elif section.startswith("PATIENT JOURNEY"):
-                patient_journey = section.replace("PATIENT JOURNEY\n", "").strip()
-        
-        # Enhanced intelligence gathering (run in background)
-        clinical_trials_data = await search_clinical_trials(request.therapy_area)
-        competitive_landscape = await generate_competitive_analysis(request.therapy_area, request.api_key)
-        regulatory_intelligence = await search_regulatory_intelligence(request.therapy_area, request.api_key)
+
+        # The core section analysis and the three enrichment calls are all
+        # independent and IO-bound, so run the whole fan-out concurrently;
+        # wall time collapses to the slowest single call
+        response, clinical_trials_data, competitive_landscape, regulatory_intelligence = await asyncio.gather(
+            _send_llm_message(chat, user_message),
+            search_clinical_trials(request.therapy_area),
+            generate_competitive_analysis(request.therapy_area, request.api_key),
+            search_regulatory_intelligence(request.therapy_area, request.api_key),
+            return_exceptions=True
+        )
+        # The core analysis is required; enrichment failures degrade to empty defaults
+        if isinstance(response, Exception):
+            raise response
+        if isinstance(clinical_trials_data, Exception):
+            clinical_trials_data = []
+        if isinstance(competitive_landscape, Exception):
+            competitive_landscape = {}
+        if isinstance(regulatory_intelligence, Exception):
+            regulatory_intelligence = {}
+
+        # Extract all five fixed sections in a single regex pass
+        sections = {
+            match.group("name"): match.group("body").strip()
+            for match in _SECTION_RE.finditer(response)
+        }
+        disease_summary = sections.get("DISEASE SUMMARY", "")
+        staging = sections.get("STAGING", "")
+        biomarkers = sections.get("BIOMARKERS", "")
+        treatment_algorithm = sections.get("TREATMENT ALGORITHM", "")
+        patient_journey = sections.get("PATIENT JOURNEY", "")
         
         # Create analysis object with enhanced data
         analysis = TherapyAreaAnalysis(
@@ -727,111 +1178,83 @@ async def analyze_therapy_area(request: TherapyAreaRequest):
             regulatory_intelligence=regulatory_intelligence
         )
         
-        # Generate risk assessment
-        analysis_dict = analysis.dict()
+        # Serialize once: the risk assessment input and the Mongo document
+        # share the same dump instead of deep-copying the model twice
+        analysis_dict = analysis.model_dump(mode="python")
         risk_assessment = await generate_risk_assessment(request.therapy_area, analysis_dict, request.api_key)
         analysis.risk_assessment = risk_assessment
-        
+        analysis_dict["risk_assessment"] = risk_assessment
+
         # Save to database
-        await db.therapy_analyses.insert_one(analysis.dict())
-        
+        await db.therapy_analyses.insert_one(analysis_dict)
+
         return analysis
         
     except Exception as e:
-        logger.error(f"Error in therapy analysis: {str(e)}")
+        logger.exception("Error in therapy analysis")
         raise HTTPException(status_code=500, detail=f"Analysis failed: {str(e)}")
 
 @api_router.post("/generate-funnel", response_model=PatientFlowFunnel)
 async def generate_patient_flow_funnel(request: PatientFlowFunnelRequest):
     try:
-        analysis = await db.therapy_analyses.find_one({"id": request.analysis_id})
+        # Only the prompt slices and the competitive landscape are used here
+        analysis = await db.therapy_analyses.find_one(
+            {"id": request.analysis_id},
+            projection={
+                "_id": 0, "id": 1, "disease_summary": 1, "treatment_algorithm": 1,
+                "patient_journey": 1, "competitive_landscape": 1
+            }
+        )
         if not analysis:
             raise HTTPException(status_code=404, detail="Analysis not found")
         
-        from emergentintegrations.llm.chat import LlmChat, UserMessage
-        
+        LlmChat, UserMessage, _ = _get_chat_factory(request.api_key)
+
         chat = LlmChat(
             api_key=request.api_key,
-            session_id=f"funnel_generation_{uuid.uuid4()}",
+            session_id=_session_id("funnel_generation"),
             system_message="""You are a pharmaceutical forecasting expert specializing in patient flow modeling and market analysis.
             Create detailed patient flow funnels suitable for pharmaceutical forecasting models based on therapy area analysis."""
-        ).with_model("anthropic", "claude-sonnet-4-20250514").with_max_tokens(4096)
-        
-        prompt = f"""
-        Based on the following therapy area analysis for {request.therapy_area}, create a comprehensive patient flow funnel suitable for pharmaceutical forecasting:
-        
-        THERAPY AREA: {request.therapy_area}
-        DISEASE SUMMARY: {analysis['disease_summary'][:500]}...
-        TREATMENT ALGORITHM: {analysis['treatment_algorithm'][:500]}...
-        PATIENT JOURNEY: {analysis['patient_journey'][:500]}...
-        
-        Please provide your response in exactly this JSON structure:
+        ).with_model("anthropic", LLM_MODEL).with_max_tokens(4096)
         
-        {{
-            "funnel_stages": [
-                {{
-                    "stage": "Total Population at Risk",
-                    "description": "Overall population that could develop this condition",
-                    "percentage": "100%",
-                    "notes": "Base population estimates"
-                }},
-                {{
-                    "stage": "Disease Incidence/Prevalence",
-                    "description": "Population that develops or has the condition",
-                    "percentage": "X%",
-                    "notes": "Epidemiological data"
-                }},
-                {{
-                    "stage": "Diagnosis Rate",
-                    "description": "Patients who get properly diagnosed",
-                    "percentage": "X%",
-                    "notes": "Diagnosis challenges and rates"
-                }},
-                {{
-                    "stage": "Treatment Eligible",
-                    "description": "Diagnosed patients eligible for treatment",
-                    "percentage": "X%",
-                    "notes": "Contraindications and eligibility criteria"
-                }},
-                {{
-                    "stage": "Treated Patients",
-                    "description": "Patients actually receiving treatment",
-                    "percentage": "X%",
-                    "notes": "Treatment uptake and access"
-                }},
-                {{
-                    "stage": "Target Patient Population",
-                    "description": "Specific target for your therapy/product",
-                    "percentage": "X%",
-                    "notes": "Specific targeting criteria"
-                }}
-            ],
-            "total_addressable_population": "Detailed TAM analysis with numbers and rationale",
-            "forecasting_notes": "Key assumptions, market dynamics, competitive landscape considerations, and forecasting methodology recommendations"
-        }}
-        
-        Fill in realistic percentages and detailed descriptions based on current medical literature and market data for {request.therapy_area}.
-        """
-        
-        user_message = UserMessage(text=prompt)
-        response = await chat.send_message(user_message)
+        prompt = FUNNEL_PROMPT_TMPL.substitute(
+            therapy_area=request.therapy_area,
+            disease_summary=analysis['disease_summary'][:500],
+            treatment_algorithm=analysis['treatment_algorithm'][:500],
+            patient_journey=analysis['patient_journey'][:500],
+        )
         
-        # Parse JSON response
-        import json
-        try:
-            json_start = response.find('{')
-            json_end = response.rfind('}') + 1
-            json_str = response[json_start:json_end]
-            parsed_response = json.loads(json_str)
-        except:
-            parsed_response = {
-                "funnel_stages": [
-                    {"stage": "Total Population", "description": "Analysis generated", "percentage": "100%", "notes": "See full response"},
-                    {"stage": "Target Population", "description": "Detailed analysis provided", "percentage": "Variable", "notes": response[:200] + "..."}
-                ],
-                "total_addressable_population": "See full analysis response",
-                "forecasting_notes": response
-            }
+        # The prompt is deterministic per analysis content, so a hash of it
+        # keys a short-lived cache of the parsed funnel; hits skip the LLM
+        # call entirely
+        prompt_hash = hashlib.sha256(prompt.encode()).hexdigest()
+        cached_funnel = await db.funnel_cache.find_one({"prompt_hash": prompt_hash})
+        if cached_funnel:
+            parsed_response = cached_funnel["parsed_response"]
+        else:
+            user_message = UserMessage(text=prompt)
+            response = await _send_llm_message(chat, user_message)
+
+            # Parse the first complete JSON object out of the response
+            parsed_response = extract_first_json_object(response)
+            if parsed_response is not None:
+                # Only cache clean parses; a malformed response falls through
+                # to the degraded fallback below and the next request retries
+                # with a fresh LLM call
+                await db.funnel_cache.update_one(
+                    {"prompt_hash": prompt_hash},
+                    {"$set": {"parsed_response": parsed_response, "cached_at": utcnow()}},
+                    upsert=True
+                )
+            else:
+                parsed_response = {
+                    "funnel_stages": [
+                        {"stage": "Total Population", "description": "Analysis generated", "percentage": "100%", "notes": "See full response"},
+                        {"stage": "Target Population", "description": "Detailed analysis provided", "percentage": "Variable", "notes": response[:200] + "..."}
+                    ],
+                    "total_addressable_population": "See full analysis response",
+                    "forecasting_notes": response
+                }
         
         # Generate scenario models
         scenario_models = await generate_scenario_models(
@@ -849,7 +1272,7 @@ async def generate_patient_flow_funnel(request: PatientFlowFunnelRequest):
         
         if analysis.get('competitive_landscape'):
             visualization_data["market_chart"] = create_market_analysis_chart(analysis['competitive_landscape'])
-        
+
         funnel = PatientFlowFunnel(
             therapy_area=request.therapy_area,
             analysis_id=request.analysis_id,
@@ -859,13 +1282,26 @@ async def generate_patient_flow_funnel(request: PatientFlowFunnelRequest):
             scenario_models=scenario_models,
             visualization_data=visualization_data
         )
-        
-        await db.patient_flow_funnels.insert_one(funnel.dict())
-        
+
+        # The funnel insert and the analysis chart update target different
+        # collections, so issue both round-trips concurrently with the
+        # relaxed write concern (both are regenerable derived data)
+        await asyncio.gather(
+            db.patient_flow_funnels.with_options(write_concern=FAST_WRITE).insert_one(funnel.model_dump()),
+            db.therapy_analyses.with_options(write_concern=FAST_WRITE).update_one(
+                {"id": request.analysis_id},
+                {"$set": {
+                    "visualization_data": visualization_data,
+                    "scenario_models": scenario_models,
+                    "updated_at": utcnow()
+                }}
+            )
+        )
+
         return funnel
         
     except Exception as e:
-        logger.error(f"Error in funnel generation: {str(e)}")
+        logger.exception("Error in funnel generation")
         raise HTTPException(status_code=500, detail=f"Funnel generation failed: {str(e)}")
 
 @api_router.post("/competitive-analysis")
@@ -876,9 +1312,24 @@ async def generate_competitive_intel(request: CompetitiveAnalysisRequest):
         if not analysis:
             raise HTTPException(status_code=404, detail="Analysis not found")
         
-        # Enhanced competitive analysis with clinical trials data
-        competitive_data = await generate_competitive_analysis(request.therapy_area, request.api_key)
-        clinical_trials = await search_clinical_trials(request.therapy_area)
+        # This endpoint is the explicit "regenerate" action, so drop the
+        # cached entries first and let the calls below repopulate them
+        cache_key = research_cache_key(request.therapy_area)
+        await asyncio.gather(
+            invalidate_research_cache("competitive_analysis", cache_key),
+            invalidate_research_cache("clinical_trials", cache_key)
+        )
+
+        # Enhanced competitive analysis with clinical trials data (run concurrently)
+        competitive_data, clinical_trials = await asyncio.gather(
+            generate_competitive_analysis(request.therapy_area, request.api_key),
+            search_clinical_trials(request.therapy_area),
+            return_exceptions=True
+        )
+        if isinstance(competitive_data, Exception):
+            competitive_data = {}
+        if isinstance(clinical_trials, Exception):
+            clinical_trials = []
         
         # Update analysis with enhanced competitive intelligence
         await db.therapy_analyses.update_one(
@@ -886,7 +1337,7 @@ async def generate_competitive_intel(request: CompetitiveAnalysisRequest):
             {"$set": {
                 "competitive_landscape": competitive_data,
                 "clinical_trials_data": clinical_trials[:15],
-                "updated_at": datetime.utcnow()
+                "updated_at": utcnow()
             }}
         )
         
@@ -894,11 +1345,11 @@ async def generate_competitive_intel(request: CompetitiveAnalysisRequest):
             "status": "success",
             "competitive_landscape": competitive_data,
             "clinical_trials_count": len(clinical_trials),
-            "updated_at": datetime.utcnow()
+            "updated_at": utcnow()
         }
         
     except Exception as e:
-        logger.error(f"Competitive analysis error: {str(e)}")
+        logger.exception("Competitive analysis error")
         raise HTTPException(status_code=500, detail=f"Competitive analysis failed: {str(e)}")
 
 @api_router.post("/scenario-modeling")
@@ -916,89 +1367,149 @@ async def generate_scenario_analysis(request: ScenarioModelingRequest):
             request.api_key
         )
         
-        # Update analysis with scenario models
+        # Reuse the cached chart JSON when the scenario models are unchanged;
+        # otherwise re-serialize and persist the new chart alongside them
+        cached_charts = analysis.get('visualization_data') or {}
+        if analysis.get('scenario_models') == scenario_models and cached_charts.get('scenario_chart'):
+            visualization_chart = cached_charts['scenario_chart']
+        else:
+            visualization_chart = create_scenario_comparison_chart(scenario_models)
+
         await db.therapy_analyses.update_one(
             {"id": request.analysis_id},
             {"$set": {
                 "scenario_models": scenario_models,
-                "updated_at": datetime.utcnow()
+                "visualization_data.scenario_chart": visualization_chart,
+                "updated_at": utcnow()
             }}
         )
         
-        # Generate visualization
-        visualization_chart = create_scenario_comparison_chart(scenario_models)
-        
         return {
             "status": "success",
             "scenario_models": scenario_models,
             "visualization": visualization_chart,
-            "updated_at": datetime.utcnow()
+            "updated_at": utcnow()
         }
         
     except Exception as e:
-        logger.error(f"Scenario modeling error: {str(e)}")
+        logger.exception("Scenario modeling error")
         raise HTTPException(status_code=500, detail=f"Scenario modeling failed: {str(e)}")
 
-@api_router.post("/export")
-async def export_analysis(request: ExportRequest):
-    """Export analysis in various formats"""
+@api_router.post("/export", status_code=202)
+async def export_analysis(request: ExportRequest, background_tasks: BackgroundTasks):
+    """Queue an export job and return immediately with a job id"""
     try:
         analysis = await db.therapy_analyses.find_one({"id": request.analysis_id})
         if not analysis:
             raise HTTPException(status_code=404, detail="Analysis not found")
-        
-        funnel = await db.patient_flow_funnels.find_one({"analysis_id": request.analysis_id})
-        
-        if request.export_type == "pdf":
-            export_data = generate_pdf_report(analysis, funnel)
-            if export_data:
-                return {
-                    "status": "success",
-                    "export_type": "pdf",
-                    "data": export_data,
-                    "filename": f"{analysis['therapy_area'].replace(' ', '_')}_analysis.pdf"
-                }
-        
-        elif request.export_type == "excel":
-            export_data = generate_excel_export(analysis, funnel)
-            if export_data:
-                return {
-                    "status": "success", 
-                    "export_type": "excel",
-                    "data": export_data,
-                    "filename": f"{analysis['therapy_area'].replace(' ', '_')}_model.xlsx"
-                }
-        
-        raise HTTPException(status_code=400, detail="Invalid export type or generation failed")
-        
+
+        if request.export_type not in ("pdf", "excel"):
+            raise HTTPException(status_code=400, detail="Invalid export type")
+
+        job_id = str(uuid.uuid4())
+        await db.export_jobs.insert_one({
+            "id": job_id,
+            "analysis_id": request.analysis_id,
+            "export_type": request.export_type,
+            "status": "pending",
+            "created_at": utcnow()
+        })
+        background_tasks.add_task(run_export, job_id, request)
+
+        return {"job_id": job_id, "status": "processing"}
+
+    except HTTPException:
+        raise
     except Exception as e:
-        logger.error(f"Export error: {str(e)}")
+        logger.exception("Export error")
         raise HTTPException(status_code=500, detail=f"Export failed: {str(e)}")
 
-@api_router.get("/analyses", response_model=List[TherapyAreaAnalysis])
-async def get_therapy_analyses():
-    analyses = await db.therapy_analyses.find().sort("created_at", -1).to_list(50)
-    return [TherapyAreaAnalysis(**analysis) for analysis in analyses]
+EXPORT_MEDIA_TYPES = {
+    "pdf": "application/pdf",
+    "excel": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+}
+
+@api_router.get("/export/{job_id}")
+async def get_export_job(job_id: str):
+    """Poll an export job for completion (the payload is served by /download)"""
+    job = await db.export_jobs.find_one({"id": job_id}, projection={"_id": 0, "data": 0})
+    if not job:
+        raise HTTPException(status_code=404, detail="Export job not found")
+    return job
+
+@api_router.get("/export/{job_id}/download")
+async def download_export(job_id: str):
+    """Stream the finished export as raw bytes"""
+    job = await db.export_jobs.find_one({"id": job_id})
+    if not job:
+        raise HTTPException(status_code=404, detail="Export job not found")
+    if job.get("status") != "done" or not job.get("data"):
+        raise HTTPException(status_code=409, detail="Export not ready")
+
+    return StreamingResponse(
+        BytesIO(job["data"]),
+        media_type=EXPORT_MEDIA_TYPES.get(job["export_type"], "application/octet-stream"),
+        headers={
+            "Content-Disposition": f'attachment; filename="{job["filename"]}"',
+            "Content-Length": str(len(job["data"])),
+        }
+    )
+
+# The read endpoints below return the stored documents directly (minus _id):
+# the data was validated when we wrote it, so re-validating through
+# response_model on every GET only burned CPU on the largest payloads
+@api_router.get("/analyses")
+async def get_therapy_analyses(limit: int = Query(20, ge=1, le=100), after: Optional[str] = None):
+    """List analyses newest-first; pass next_cursor back as `after` to page"""
+    query = {}
+    if after:
+        try:
+            query["created_at"] = {"$lt": datetime.fromisoformat(after)}
+        except ValueError:
+            raise HTTPException(status_code=422, detail="Invalid `after` cursor")
+
+    # The list view only renders these four fields; skip shipping the large
+    # summary/competitive/trials blobs entirely. The (created_at, id) index
+    # serves both the sort and the cursor range scan.
+    items = await db.therapy_analyses.find(
+        query, {"_id": 0, "id": 1, "therapy_area": 1, "product_name": 1, "created_at": 1}
+    ).sort("created_at", -1).to_list(limit)
+
+    next_cursor = items[-1]["created_at"].isoformat() if len(items) == limit else None
+    return {"items": items, "next_cursor": next_cursor}
 
 @api_router.get("/analysis/{analysis_id}")
 async def get_analysis_details(analysis_id: str):
-    analysis = await db.therapy_analyses.find_one({"id": analysis_id})
-    if not analysis:
+    # One aggregation round-trip fetches the analysis and its funnel
+    # together instead of two dependent find_one calls
+    docs = await db.therapy_analyses.aggregate([
+        {"$match": {"id": analysis_id}},
+        {"$limit": 1},
+        {"$lookup": {
+            "from": "patient_flow_funnels",
+            "localField": "id",
+            "foreignField": "analysis_id",
+            "as": "funnel"
+        }},
+        {"$project": {"_id": 0, "funnel._id": 0}}
+    ]).to_list(1)
+    if not docs:
         raise HTTPException(status_code=404, detail="Analysis not found")
-    
-    funnel = await db.patient_flow_funnels.find_one({"analysis_id": analysis_id})
-    
+
+    analysis = docs[0]
+    funnels = analysis.pop("funnel", [])
+
     return {
-        "analysis": TherapyAreaAnalysis(**analysis),
-        "funnel": PatientFlowFunnel(**funnel) if funnel else None
+        "analysis": analysis,
+        "funnel": funnels[0] if funnels else None
     }
 
 @api_router.get("/funnels/{analysis_id}")
 async def get_funnel_by_analysis(analysis_id: str):
-    funnel = await db.patient_flow_funnels.find_one({"analysis_id": analysis_id})
+    funnel = await db.patient_flow_funnels.find_one({"analysis_id": analysis_id}, {"_id": 0})
     if not funnel:
         return None
-    return PatientFlowFunnel(**funnel)
+    return funnel
 
 @api_router.get("/search/clinical-trials")
 async def search_trials_endpoint(therapy_area: str):
@@ -1017,13 +1528,37 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
-logger = logging.getLogger(__name__)
+@app.on_event("startup")
+async def startup_http_client():
+    # Reuse one pooled client for every outbound call so repeat requests
+    # keep connections alive instead of paying a TCP+TLS handshake each time
+    app.state.http_client = httpx.AsyncClient(
+        timeout=HTTP_TIMEOUTS["default"],
+        limits=HTTP_LIMITS
+    )
+    # Declare lookup indexes up front so id/analysis_id filters stay index
+    # seeks instead of collection scans as the data grows; the research-cache
+    # TTL index lets Mongo expire stale entries on its own. analysis_id on
+    # funnels is intentionally non-unique: regenerating a funnel inserts a
+    # new document per run. created_at sorts are served by the compound
+    # (created_at, id) prefix.
+    await asyncio.gather(
+        db.therapy_analyses.create_index("id", unique=True),
+        db.patient_flow_funnels.create_index([("analysis_id", 1), ("created_at", -1)]),
+        db.export_jobs.create_index("id", unique=True),
+        db.therapy_analyses.create_index([("created_at", -1), ("id", 1)]),
+        db.research_cache.create_index([("source", 1), ("key", 1)], unique=True),
+        db.research_cache.create_index(
+            "cached_at", expireAfterSeconds=int(RESEARCH_CACHE_TTL.total_seconds())
+        ),
+        db.status_checks.create_index([("timestamp", 1), ("client_name", 1)]),
+        db.funnel_cache.create_index("prompt_hash", unique=True),
+        db.funnel_cache.create_index("cached_at", expireAfterSeconds=86400),
+    )
+    status_check_batcher.start()
 
 @app.on_event("shutdown")
 async def shutdown_db_client():
+    await status_check_batcher.stop()
+    await app.state.http_client.aclose()
     client.close()
\ No newline at end of file
@@ -52,7 +52,7 @@ const App = () => {
   const loadSavedAnalyses = async () => {
     try {
       const response = await axios.get(`${API}/analyses`);
-      setSavedAnalyses(response.data);
+      setSavedAnalyses(response.data.items);
     } catch (error) {
       console.error("Failed to load analyses:", error);
     }
@@ -209,26 +209,32 @@ const App = () => {
         export_type: exportType
       });
 
-      if (response.data.status === "success") {
-        // Create download link
-        const byteCharacters = atob(response.data.data);
-        const byteNumbers = new Array(byteCharacters.length);
-        for (let i = 0; i < byteCharacters.length; i++) {
-          byteNumbers[i] = byteCharacters.charCodeAt(i);
-        }
-        const byteArray = new Uint8Array(byteNumbers);
-        const blob = new Blob([byteArray], { 
-          type: exportType === 'pdf' ? 'application/pdf' : 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet' 
+      // Poll the export job until it completes
+      const jobId = response.data.job_id;
+      let job = null;
+      for (let attempt = 0; attempt < 60; attempt++) {
+        await new Promise((resolve) => setTimeout(resolve, 2000));
+        const jobResponse = await axios.get(`${API}/export/${jobId}`);
+        job = jobResponse.data;
+        if (job.status === "done" || job.status === "failed") break;
+      }
+
+      if (job && job.status === "done") {
+        // Stream the raw bytes from the download endpoint
+        const fileResponse = await axios.get(`${API}/export/${jobId}/download`, {
+          responseType: "blob"
         });
 
-        const url = window.URL.createObjectURL(blob);
+        const url = window.URL.createObjectURL(fileResponse.data);
         const link = document.createElement('a');
         link.href = url;
-        link.download = response.data.filename;
+        link.download = job.filename;
         document.body.appendChild(link);
         link.click();
         document.body.removeChild(link);
         window.URL.revokeObjectURL(url);
+      } else {
+        setError("Export failed. Please try again.");
       }
     } catch (error) {
       console.error("Export error:", error);